@@ -16,7 +16,10 @@ import re
 import os
 import time
 import subprocess
-import glob
+import json
+import select
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # ================ CONFIG ================
@@ -24,16 +27,172 @@ BAHASA_ASAL = "en"
 BAHASA_TUJUAN = "id"
 JEDA_TERJEMAH = 0.5
 LOG_LEVEL = "ERROR"  # Will be normalized to uppercase
+PROGRESS_INTERVAL = 0.1  # Redraw the progress line at most every N seconds
 
 # BATCH SETTINGS
 USE_BATCH = True
 BATCH_SEPARATOR = "|~|~|"
 BATCH_SIZE = 5
 MAX_BATCH_CHARS = 1000
+USE_TRANS_SHELL = True  # Keep `trans -shell` processes alive instead of spawning per batch
+MAX_WORKERS = 8  # Parallel batch translations (JEDA_TERJEMAH still caps the request rate)
+
+# CACHE SETTINGS (persist translations across runs)
+USE_CACHE = True
+CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache",
+    f"renpy_translate_{BAHASA_ASAL}_{BAHASA_TUJUAN}.json"
+)
 # ========================================
 
+# Compiled once, reused for every line
+_QUOTE_RE = re.compile(r'"([^"]*)"')
+_ASSET_EXTS = ('.png', '.jpg', '.mp3', '.ogg', '.wav')
+# After a blank reply line, how long to wait for a non-blank one before
+# accepting the blank as the answer (seconds)
+_SHELL_QUIET_WINDOW = 0.2
+
+
+def _load_trans_cache():
+    """Load persisted translations (source text -> translation)"""
+    if not USE_CACHE or not os.path.exists(CACHE_FILE):
+        return {}
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (IOError, ValueError) as e:
+        print(f"⚠️ Could not load translation cache: {e}")
+        return {}
+
+
+def _save_trans_cache(cache):
+    """Atomically write translations back to CACHE_FILE"""
+    if not USE_CACHE:
+        return
+    tmp_file = CACHE_FILE + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_file, CACHE_FILE)
+    except (IOError, OSError) as e:
+        print(f"⚠️ Could not save translation cache: {e}")
+
+
+class _TransShell:
+    """One long-lived `trans -shell` process, queried line by line"""
+
+    def __init__(self):
+        self._buf = b""
+        self.eof = False  # Set once the shell has exited or its pipes broke
+        # Set when a blank reply was accepted after the quiet window: a late real
+        # reply could still arrive and pair with the next query, so don't reuse
+        self.ambiguous = False
+        self.proc = subprocess.Popen(
+            ["trans", "-shell", "-brief", "-no-ansi", "-no-rlwrap", f"{BAHASA_ASAL}:{BAHASA_TUJUAN}"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,  # Prompt goes to stderr; an unread PIPE would fill up
+            text=True,
+            encoding='utf-8',
+            bufsize=1  # Streaming: line-buffered so each query is flushed as a whole line
+        )
+
+    def _read_line(self, deadline):
+        """
+        Glue raw stdout chunks back into whole lines.
+        Returns None on timeout or when the shell has exited (self.eof is set).
+        """
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                self.eof = True
+                return None
+            self._buf += chunk
+        line, self._buf = self._buf.split(b"\n", 1)
+        return line.decode('utf-8', errors='replace')
+
+    def query(self, text, timeout):
+        """
+        Send one line and return the reply ('' when the shell answered blank).
+        Returns None on timeout or exit; check self.eof to tell them apart.
+        """
+        try:
+            # Drop stale output left over from a previous query
+            fd = self.proc.stdout.fileno()
+            while select.select([fd], [], [], 0)[0]:
+                if not os.read(fd, 4096):
+                    self.eof = True
+                    return None
+            self._buf = b""
+            
+            self.proc.stdin.write(text + '\n')
+            self.proc.stdin.flush()
+            
+            deadline = time.monotonic() + timeout
+            answered = False
+            while True:
+                line = self._read_line(deadline)
+                if line is None:
+                    # A blank answer followed by silence is still an answer
+                    if answered and not self.eof:
+                        self.ambiguous = True
+                        return ''
+                    return None
+                line = line.strip()
+                if line:
+                    return line
+                # Blank line: give a real reply a short moment, not the full timeout
+                answered = True
+                deadline = min(deadline, time.monotonic() + _SHELL_QUIET_WINDOW)
+        except (OSError, ValueError):
+            self.eof = True
+            return None
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except Exception:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class _RateLimiter:
+    """Token bucket shared by all workers: one request per `interval` seconds on average"""
+
+    def __init__(self, interval, burst=1):
+        self.interval = interval
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.interval <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) / self.interval)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.interval
+            time.sleep(wait)
+
+
 class RenPyAutoTranslator:
-    def __init__(self, input_file):
+    def __init__(self, input_file, trans_cache=None):
         self.input_file = input_file
         self.output_file = self._generate_output_name()
         self.log_file = self._generate_log_name()
@@ -54,9 +213,29 @@ class RenPyAutoTranslator:
             'total_processed': 0,
             'batch_success': 0,
             'batch_failed': 0,
-            'fallback_individual': 0
+            'fallback_individual': 0,
+            'cache_hits': 0
         }
 
+        # Memo of source text -> translation, avoids re-running trans on duplicates.
+        # main() passes one shared dict so every file reuses the same memo.
+        self._trans_cache = trans_cache if trans_cache is not None else {}
+        self._cache_dirty = False
+
+        # Pool of persistent `trans -shell` processes (started lazily, see _shell_translate)
+        self._idle_shells = []
+        self._shell_lock = threading.Lock()
+        self._shell_failed = False
+
+        # Batch workers share the counters, the log file and the request budget
+        self._stats_lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._rate_limiter = _RateLimiter(JEDA_TERJEMAH, burst=MAX_WORKERS if USE_BATCH else 1)
+        self._executor = None
+        self._out = None
+        self._log_fh = None
+        self._last_progress_t = 0.0
+
         self.skip_keywords = [
             'show ', 'scene ', 'play ', 'stop ', 'queue ',
             'image ', 'define ', 'transform ', 'screen ',
@@ -66,6 +245,10 @@ class RenPyAutoTranslator:
             'nvl ', 'window ', 'voice ', 'sound ',
             'music ', 'audio ', 'renpy.', 'camera '
         ]
+        # One anchored alternation instead of a startswith() per keyword
+        self._skip_re = re.compile(
+            r'^(?:' + '|'.join(re.escape(k.lower()) for k in self.skip_keywords) + r')'
+        )
 
     def _generate_output_name(self):
         base, ext = os.path.splitext(self.input_file)
@@ -81,81 +264,168 @@ class RenPyAutoTranslator:
         if LOG_LEVEL == "SUMMARY":
             return
         try:
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                f.write("=== REN'PY TRANSLATION LOG v7.1 - COPILOT FIXES ===\n")
-                f.write(f"Tanggal: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Input: {self.input_file}\n")
-                f.write(f"Output: {self.output_file}\n")
-                f.write(f"Bahasa: {BAHASA_ASAL} -> {BAHASA_TUJUAN}\n")
-                f.write(f"Mode: {'BATCH' if USE_BATCH else 'SEQUENTIAL'}\n")
-                if USE_BATCH:
-                    f.write(f"Batch Size: {BATCH_SIZE} dialogues\n")
-                    f.write(f"Separator: '{BATCH_SEPARATOR}'\n")
-                f.write(f"Log Level: {LOG_LEVEL}\n")
-                f.write("="*50 + "\n\n")
+            # Kept open for the whole run; closed by _close_log_file()
+            self._log_fh = open(self.log_file, 'w', encoding='utf-8', buffering=1 << 16)
+            f = self._log_fh
+            f.write("=== REN'PY TRANSLATION LOG v7.1 - COPILOT FIXES ===\n")
+            f.write(f"Tanggal: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Input: {self.input_file}\n")
+            f.write(f"Output: {self.output_file}\n")
+            f.write(f"Bahasa: {BAHASA_ASAL} -> {BAHASA_TUJUAN}\n")
+            f.write(f"Mode: {'BATCH' if USE_BATCH else 'SEQUENTIAL'}\n")
+            if USE_BATCH:
+                f.write(f"Batch Size: {BATCH_SIZE} dialogues\n")
+                f.write(f"Separator: '{BATCH_SEPARATOR}'\n")
+            f.write(f"Log Level: {LOG_LEVEL}\n")
+            f.write("="*50 + "\n\n")
         except IOError as e:
             print(f"⚠️ Could not create log file: {e}")
+            self._log_fh = None
 
-    def _log_translation(self, line_num, status, original_text, translated_text="", error_msg="", context=""):
-        if LOG_LEVEL == "SUMMARY":
+    def _write_log(self, text, flush=False):
+        """Append to the open log file; log failures never stop a translation"""
+        if self._log_fh is None:
             return
-        elif LOG_LEVEL == "ERROR" and status == "SUCCESS":
+        try:
+            with self._log_lock:
+                self._log_fh.write(text)
+                if flush:
+                    self._log_fh.flush()
+        except (IOError, ValueError):
+            pass  # Silently fail if log write fails
+
+    def _flush_log(self):
+        if self._log_fh is None:
+            return
+        try:
+            with self._log_lock:
+                self._log_fh.flush()
+        except (IOError, ValueError):
+            pass
+
+    def _close_log_file(self):
+        if self._log_fh is None:
             return
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(f"BARIS {line_num} | STATUS: {status}\n")
-                if context:
-                    f.write(f"CONTEXT: {context.strip()}\n")
-                f.write(f"ASLI   : '{original_text}'\n")
-                if translated_text and translated_text != original_text:
-                    f.write(f"HASIL  : '{translated_text}'\n")
-                if error_msg:
-                    f.write(f"ERROR  : {error_msg}\n")
-                f.write("-" * 40 + "\n\n")
+            self._log_fh.close()
         except IOError:
-            pass  # Silently fail if log write fails
+            pass
+        self._log_fh = None
 
-    def _should_translate(self, line, text_match):
-        """Check if text should be translated"""
-        before_quote = line[:text_match.start()].strip().lower()
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self.translation_stats[key] += n
 
-        for keyword in self.skip_keywords:
-            if before_quote.startswith(keyword.lower()):
-                return False
+    def _log_translation(self, line_num, status, original_text, translated_text="", error_msg="", context=""):
+        if LOG_LEVEL == "SUMMARY":
+            return
+        elif LOG_LEVEL == "ERROR" and status == "SUCCESS":
+            return
+        entry = [f"BARIS {line_num} | STATUS: {status}\n"]
+        if context:
+            entry.append(f"CONTEXT: {context.strip()}\n")
+        entry.append(f"ASLI   : '{original_text}'\n")
+        if translated_text and translated_text != original_text:
+            entry.append(f"HASIL  : '{translated_text}'\n")
+        if error_msg:
+            entry.append(f"ERROR  : {error_msg}\n")
+        entry.append("-" * 40 + "\n\n")
+        self._write_log(''.join(entry))
 
-        if '$' in before_quote:
+    def _should_translate(self, line, text_match, line_lower=None):
+        """
+        Check if text should be translated.
+        line_lower: the whole line lower-cased once by the caller, shared by all its matches
+        """
+        if line_lower is None:
+            before_quote = line[:text_match.start()].strip().lower()
+        else:
+            before_quote = line_lower[:text_match.start()].strip()
+
+        if self._skip_re.match(before_quote):
             return False
 
-        if before_quote.endswith(':'):
+        if '$' in before_quote:
             return False
 
-        if before_quote.endswith('old'):
+        if before_quote.endswith((':', 'old')):
             return False
 
         text_content = text_match.group(1)
-        if (text_content.endswith(('.png', '.jpg', '.mp3', '.ogg', '.wav')) or
+        if (text_content.endswith(_ASSET_EXTS) or
             '/' in text_content or '\\' in text_content):
             return False
 
         return True
 
+    def close(self):
+        """Release the persistent translate-shell processes"""
+        with self._shell_lock:
+            shells, self._idle_shells = self._idle_shells, []
+        for shell in shells:
+            shell.close()
+
+    def __del__(self):
+        self.close()
+
+    def _shell_translate(self, text, timeout):
+        """
+        Translate through a pooled persistent shell (one per concurrent worker).
+        Returns None only when the shell could not start or has exited, so callers
+        fall back to `trans` one-shot. A reply (even an empty one) is final, and a
+        timeout raises subprocess.TimeoutExpired like the one-shot call would.
+        """
+        if not USE_TRANS_SHELL or self._shell_failed:
+            return None
+        
+        with self._shell_lock:
+            shell = self._idle_shells.pop() if self._idle_shells else None
+        if shell is None:
+            try:
+                shell = _TransShell()
+            except (OSError, ValueError):
+                self._shell_failed = True
+                return None
+        
+        translated = shell.query(text, timeout)
+        if translated is None:
+            # Shell unusable (no -shell support, exited or hung): stop using it
+            shell.close()
+            self._shell_failed = True
+            if shell.eof:
+                return None
+            raise subprocess.TimeoutExpired(shell.proc.args, timeout)
+        
+        if shell.ambiguous:
+            # Reply framing is uncertain: retire this process, the next query starts a fresh one
+            shell.close()
+            return translated
+        
+        with self._shell_lock:
+            self._idle_shells.append(shell)
+        return translated
+
     def _do_translation_single(self, text):
         """Single text translation (original method)"""
+        self._rate_limiter.acquire()
         try:
-            result = subprocess.run(
-                ["trans", "-brief", "-no-ansi", f"{BAHASA_ASAL}:{BAHASA_TUJUAN}", text],
-                capture_output=True, 
-                text=True, 
-                timeout=25,
-                encoding='utf-8'
-            )
-            
-            # Fix #8: Check stdout for errors too
-            if result.returncode != 0:
-                error_msg = result.stderr.strip() or result.stdout.strip() or "Translation command failed"
-                return None, error_msg
-            
-            translated = result.stdout.strip()
+            translated = self._shell_translate(text, timeout=25)
+            if translated is None:
+                result = subprocess.run(
+                    ["trans", "-brief", "-no-ansi", f"{BAHASA_ASAL}:{BAHASA_TUJUAN}", text],
+                    capture_output=True, 
+                    text=True, 
+                    timeout=25,
+                    encoding='utf-8',
+                    bufsize=-1  # One-shot call: block-buffered pipes, read once by communicate()
+                )
+                
+                # Fix #8: Check stdout for errors too
+                if result.returncode != 0:
+                    error_msg = result.stderr.strip() or result.stdout.strip() or "Translation command failed"
+                    return None, error_msg
+                
+                translated = result.stdout.strip()
             
             # Also check if stdout contains error keywords
             if not translated or "error" in translated.lower() or "failed" in translated.lower():
@@ -171,6 +441,8 @@ class RenPyAutoTranslator:
         """
         Batch translation using separator |~|~|
         Fix #4: Better error handling
+        Length limit and separator collisions are checked once when the batch
+        is built (see _process_pending_lines), not here.
         """
         if not texts or len(texts) == 0:
             return None, "Empty batch"
@@ -178,30 +450,25 @@ class RenPyAutoTranslator:
         # Combine with separator
         combined = BATCH_SEPARATOR.join(texts)
         
-        # Check character limit
-        if len(combined) > MAX_BATCH_CHARS:
-            return None, f"Batch too long: {len(combined)} > {MAX_BATCH_CHARS} chars"
-        
-        # Check for separator collision (Fix #4)
-        for text in texts:
-            if BATCH_SEPARATOR in text:
-                return None, "Separator collision detected"
-        
+        self._rate_limiter.acquire()
         try:
-            result = subprocess.run(
-                ["trans", "-brief", "-no-ansi", f"{BAHASA_ASAL}:{BAHASA_TUJUAN}", combined],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                encoding='utf-8'
-            )
-            
-            # Fix #8: Check both stderr and stdout
-            if result.returncode != 0:
-                error_msg = result.stderr.strip() or result.stdout.strip() or "Batch translation failed"
-                return None, error_msg
-            
-            translated = result.stdout.strip()
+            translated = self._shell_translate(combined, timeout=30)
+            if translated is None:
+                result = subprocess.run(
+                    ["trans", "-brief", "-no-ansi", f"{BAHASA_ASAL}:{BAHASA_TUJUAN}", combined],
+                    capture_output=True,
+                    text=True,
+                    timeout=30,
+                    encoding='utf-8',
+                    bufsize=-1  # One-shot call: block-buffered pipes, read once by communicate()
+                )
+                
+                # Fix #8: Check both stderr and stdout
+                if result.returncode != 0:
+                    error_msg = result.stderr.strip() or result.stdout.strip() or "Batch translation failed"
+                    return None, error_msg
+                
+                translated = result.stdout.strip()
             
             if not translated:
                 return None, "Empty batch translation result"
@@ -242,32 +509,44 @@ class RenPyAutoTranslator:
         except Exception as e:
             return None, f"Batch error: {str(e)}"
 
+    def _remember(self, text, translated):
+        self._trans_cache[text] = translated
+        self._cache_dirty = True
+
     def _translate_text(self, text, line_num, context=""):
         """Translate single text (non-batch mode or fallback)"""
-        self.translation_stats['total_processed'] += 1
+        self._count('total_processed')
 
         if not text or not text.strip():
-            self.translation_stats['empty_input'] += 1
+            self._count('empty_input')
             self._log_translation(line_num, "EMPTY_INPUT", text, context=context)
             return text
 
+        if text in self._trans_cache:
+            translated = self._trans_cache[text]
+            self._count('success')
+            self._count('cache_hits')
+            self._log_translation(line_num, "SUCCESS", text, translated, context=context)
+            return translated
+
         translated, error = self._do_translation_single(text)
 
         if error:
             if "timeout" in error.lower():
-                self.translation_stats['errors'] += 1
+                self._count('errors')
                 self._log_translation(line_num, "TIMEOUT", text, error_msg=error, context=context)
             else:
-                self.translation_stats['failed'] += 1
+                self._count('failed')
                 self._log_translation(line_num, "FAILED", text, error_msg=error, context=context)
             return text
 
         if not translated:
-            self.translation_stats['empty_output'] += 1
+            self._count('empty_output')
             self._log_translation(line_num, "EMPTY_OUTPUT", text, context=context)
             return text
 
-        self.translation_stats['success'] += 1
+        self._remember(text, translated)
+        self._count('success')
         self._log_translation(line_num, "SUCCESS", text, translated, context=context)
         return translated
 
@@ -279,21 +558,55 @@ class RenPyAutoTranslator:
         if not batch_items:
             return {}
         
+        # Serve already-translated texts from the memo, send only the rest
+        result_map = {}
+        pending_items = []
+        for item in batch_items:
+            key = (item['line_num'], item['text'])
+            if item['text'] in self._trans_cache:
+                result_map[key] = self._trans_cache[item['text']]
+                self._count('total_processed')
+                self._count('success')
+                self._count('cache_hits')
+            else:
+                pending_items.append(item)
+        
+        if not pending_items:
+            return result_map
+        batch_items = pending_items
+        
         texts_to_translate = [item['text'] for item in batch_items]
+        # Send each distinct text once and fan the result out to every occurrence
+        unique_texts = list(dict.fromkeys(texts_to_translate))
+        
+        # A lone text gains nothing from the separator protocol (and may be unbatchable).
+        # Repeats of it are served from the memo once the first one is translated.
+        if len(unique_texts) == 1:
+            for item in batch_items:
+                key = (item['line_num'], item['text'])
+                result_map[key] = self._translate_text(
+                    item['text'],
+                    item['line_num'],
+                    context=item['original_line']
+                )
+            return result_map
         
         # Try batch translation
-        translations, error = self._do_translation_batch(texts_to_translate)
+        translations, error = self._do_translation_batch(unique_texts)
         
         if translations:
             # Batch success!
-            self.translation_stats['batch_success'] += 1
-            self.translation_stats['total_processed'] += len(texts_to_translate)
-            self.translation_stats['success'] += len(translations)
+            self._count('batch_success')
+            self._count('total_processed', len(texts_to_translate))
+            self._count('success', len(texts_to_translate))
             
             # Fix #2: Use tuple (line_num, text) as key instead of id()
-            result_map = {}
-            for item, translation in zip(batch_items, translations):
+            uniq_map = dict(zip(unique_texts, translations))
+            for text, translation in uniq_map.items():
+                self._remember(text, translation)
+            for item in batch_items:
                 key = (item['line_num'], item['text'])
+                translation = uniq_map[item['text']]
                 result_map[key] = translation
                 self._log_translation(
                     item['line_num'], 
@@ -306,19 +619,15 @@ class RenPyAutoTranslator:
             return result_map
         else:
             # Batch failed, fallback to individual
-            self.translation_stats['batch_failed'] += 1
-            self.translation_stats['fallback_individual'] += len(batch_items)
+            self._count('batch_failed')
+            self._count('fallback_individual', len(batch_items))
             
-            if LOG_LEVEL != "SUMMARY":
-                try:
-                    with open(self.log_file, 'a', encoding='utf-8') as f:
-                        f.write(f"⚠️ BATCH FAILED: {error}\n")
-                        f.write(f"   Falling back to individual translation for {len(batch_items)} texts\n\n")
-                except IOError:
-                    pass
+            self._write_log(
+                f"⚠️ BATCH FAILED: {error}\n"
+                f"   Falling back to individual translation for {len(batch_items)} texts\n\n"
+            )
             
             # Fix #4: Proper fallback with tuple mapping
-            result_map = {}
             for item in batch_items:
                 translation = self._translate_text(
                     item['text'],
@@ -335,38 +644,65 @@ class RenPyAutoTranslator:
         original_line = line.rstrip()
         
         # Skip empty lines, comments, and python code
-        if (not original_line.strip() or 
-            original_line.strip().startswith('#') or
-            original_line.strip().startswith('$')):
+        stripped = original_line.lstrip()
+        if not stripped or stripped.startswith(('#', '$')):
+            return line
+        
+        # No quote, nothing to translate: skip the regex and the batch queue entirely
+        first_quote = original_line.find('"')
+        if first_quote < 0:
+            return line
+        
+        # Line opens with a Ren'Py statement (show/define/jump/renpy./...) before its
+        # first quote: every quote on it would fail _should_translate, so reject the
+        # whole line with one compiled match instead of checking quote by quote
+        head = original_line[:first_quote].strip().lower()
+        if self._skip_re.match(head) or '$' in head:
+            if not USE_BATCH and LOG_LEVEL != "SUMMARY":
+                # Keep one SKIPPED_CODE entry per quote, like the per-quote path
+                for match in _QUOTE_RE.finditer(original_line):
+                    self._count('skipped_code')
+                    self._log_translation(line_num, "SKIPPED_CODE", match.group(1), context=original_line)
+            else:
+                self._count('skipped_code', original_line.count('"') // 2)
             return line
 
+        # Lower-case once per line, not once per quoted string. Only usable when
+        # lowering keeps every character offset (a few Unicode letters expand).
+        line_lower = original_line.lower()
+        if len(line_lower) != len(original_line):
+            line_lower = None
+        
         if not USE_BATCH:
-            # Original sequential method
-            def smart_translate_match(match):
+            # Sequential method: one finditer walk, joined once (no per-match callback)
+            parts = []
+            last = 0
+            for match in _QUOTE_RE.finditer(original_line):
                 text = match.group(1)
-                if not self._should_translate(original_line, match):
-                    self.translation_stats['skipped_code'] += 1
+                parts.append(original_line[last:match.start()])
+                if not self._should_translate(original_line, match, line_lower):
+                    self._count('skipped_code')
                     self._log_translation(line_num, "SKIPPED_CODE", text, context=original_line)
-                    return f'"{text}"'
-                
-                translated = self._translate_text(text, line_num, context=original_line)
-                return f'"{translated}"'
-
-            # Fix #5: Use more robust regex
-            final_line = re.sub(r'"([^"]*)"', smart_translate_match, original_line)
-            return final_line + '\n'
+                    parts.append(match.group(0))
+                else:
+                    translated = self._translate_text(text, line_num, context=original_line)
+                    parts.append('"' + translated + '"')
+                last = match.end()
+            parts.append(original_line[last:])
+            return ''.join(parts) + '\n'
         
         # BATCH MODE: Collect texts to translate
         # Fix #5: More robust regex for quotes
-        matches = list(re.finditer(r'"([^"]*)"', original_line))
+        matches = list(_QUOTE_RE.finditer(original_line))
         texts_to_translate = []
         
         for match in matches:
             text = match.group(1)
-            if self._should_translate(original_line, match) and text.strip():
-                texts_to_translate.append((text, match))
+            if self._should_translate(original_line, match, line_lower) and text.strip():
+                # Length and separator collision are computed once, here
+                texts_to_translate.append((text, match, len(text), BATCH_SEPARATOR in text))
             else:
-                self.translation_stats['skipped_code'] += 1
+                self._count('skipped_code')
         
         # Return line info for batch processing
         return {
@@ -382,52 +718,79 @@ class RenPyAutoTranslator:
         Process batch of pending lines
         Fix #1: Remove double-fill, use single list
         Fix #2: Use tuple-based mapping
-        Fix #3: Smart delay only for full batches
+        Fix #3: Smart delay only for full batches (now a shared rate limiter)
         """
         # Collect batch items (Fix #1: single list, not double)
         batch_items = []
         
         for line_info in pending_lines:
-            for text, match in line_info['texts_to_translate']:
+            if line_info['type'] == 'raw':
+                continue
+            for text, match, length, has_separator in line_info['texts_to_translate']:
                 batch_items.append({
                     'text': text,
                     'line_num': line_info['line_num'],
                     'match': match,
-                    'original_line': line_info['original_line']
+                    'original_line': line_info['original_line'],
+                    'length': length,
+                    'batchable': not has_separator and length <= MAX_BATCH_CHARS
                 })
         
-        # Split into batches of BATCH_SIZE
+        # Split into batches of up to BATCH_SIZE texts whose joined length fits
+        # MAX_BATCH_CHARS, so _do_translation_batch never has to reject one.
+        # Unbatchable texts get a batch of their own (translated individually).
+        sep_len = len(BATCH_SEPARATOR)
+        batches = []
+        batch = []
+        running_chars = 0
+        for item in batch_items:
+            if not item['batchable']:
+                batches.append([item])
+                continue
+            extra = item['length'] + (sep_len if batch else 0)
+            if batch and (len(batch) >= BATCH_SIZE or running_chars + extra > MAX_BATCH_CHARS):
+                batches.append(batch)
+                batch = []
+                running_chars = 0
+                extra = item['length']
+            batch.append(item)
+            running_chars += extra
+        if batch:
+            batches.append(batch)
+        
+        # Translate batches concurrently.
+        # Request pacing is handled by the shared rate limiter, not a sleep per batch.
+        if self._executor is not None and len(batches) > 1:
+            batch_results = self._executor.map(self._process_batch_translation, batches)
+        else:
+            batch_results = map(self._process_batch_translation, batches)
+        
         all_translations = {}
-        for i in range(0, len(batch_items), BATCH_SIZE):
-            batch = batch_items[i:i+BATCH_SIZE]
-            batch_translations = self._process_batch_translation(batch)
+        for batch_translations in batch_results:
             all_translations.update(batch_translations)
-            
-            # Fix #3: Only delay for full batches
-            if len(batch) >= BATCH_SIZE and JEDA_TERJEMAH > 0:
-                time.sleep(JEDA_TERJEMAH)
         
         # Apply translations to lines (Fix #2: tuple-based lookup)
         result_lines = []
         for line_info in pending_lines:
+            if line_info['type'] == 'raw':
+                result_lines.append(line_info['line'])
+                continue
             original_line = line_info['original_line']
-            final_line = original_line
+            line_num = line_info['line_num']
             
-            # Sort matches by position (reverse to avoid offset issues)
-            sorted_matches = sorted(line_info['texts_to_translate'], 
-                                   key=lambda x: x[1].start(), 
-                                   reverse=True)
-            
-            for text, match in sorted_matches:
-                key = (line_info['line_num'], text)
-                translated = all_translations.get(key, text)
-                
-                start = match.start()
-                end = match.end()
-                final_line = final_line[:start] + f'"{translated}"' + final_line[end:]
+            # Rebuild the line left to right in one pass; texts_to_translate is
+            # already in match order, so no sorting or repeated slicing is needed
+            parts = []
+            last = 0
+            for text, match, _, _ in line_info['texts_to_translate']:
+                parts.append(original_line[last:match.start()])
+                parts.append('"' + all_translations.get((line_num, text), text) + '"')
+                last = match.end()
+            parts.append(original_line[last:])
             
-            result_lines.append(final_line + '\n')
+            result_lines.append(''.join(parts) + '\n')
         
+        self._flush_log()
         return result_lines
 
     def _write_summary_log(self):
@@ -437,37 +800,35 @@ class RenPyAutoTranslator:
             total_batches = self.translation_stats['batch_success'] + self.translation_stats['batch_failed']
             batch_success_rate = (self.translation_stats['batch_success'] / max(1, total_batches)) * 100
         
-        summary_text = f"""
+        # Collect the sections and join once at the end
+        parts = [f"""
 {'='*60}
 RINGKASAN TERJEMAHAN v7.1 - {os.path.basename(self.input_file)}
 {'='*60}
 Mode: {'BATCH OPTIMIZED' if USE_BATCH else 'SEQUENTIAL'}
-"""
+"""]
         if USE_BATCH:
-            summary_text += f"""
+            parts.append(f"""
 📦 BATCH STATS:
    ├─ Batch Success    : {self.translation_stats['batch_success']}
    ├─ Batch Failed     : {self.translation_stats['batch_failed']}
    ├─ Batch Success %  : {batch_success_rate:.1f}%
    └─ Fallback Individual: {self.translation_stats['fallback_individual']}
 
-"""
+""")
         
-        summary_text += f"""✅ Berhasil ditranslate : {self.translation_stats['success']}
+        parts.append(f"""✅ Berhasil ditranslate : {self.translation_stats['success']}
 ⏩ Skip (Ren'Py code)   : {self.translation_stats['skipped_code']}
 ❌ Gagal/Error         : {self.translation_stats['failed'] + self.translation_stats['errors']}
 📝 Input kosong         : {self.translation_stats['empty_input']}
 📄 Output kosong        : {self.translation_stats['empty_output']}
+♻️ Dari cache           : {self.translation_stats['cache_hits']}
 📊 Total diproses       : {self.translation_stats['total_processed']}
 📋 Total baris file     : {self.total_lines}
 🎯 Success Rate         : {success_rate:.1f}%
-"""
-        if LOG_LEVEL != "SUMMARY":
-            try:
-                with open(self.log_file, 'a', encoding='utf-8') as f:
-                    f.write(summary_text)
-            except IOError:
-                pass
+""")
+        summary_text = ''.join(parts)
+        self._write_log(summary_text, flush=True)
         print(summary_text)
 
     def _check_dependencies(self):
@@ -488,15 +849,18 @@ Mode: {'BATCH OPTIMIZED' if USE_BATCH else 'SEQUENTIAL'}
 
     def _validate_output(self):
         try:
+            # Stream the file in 1 MiB chunks instead of loading it whole
+            counts = dict.fromkeys('"{}[]', 0)
             with open(self.output_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+                for chunk in iter(lambda: f.read(1 << 20), ''):
+                    for ch in counts:
+                        counts[ch] += chunk.count(ch)
             issues = []
-            quote_count = content.count('"')
-            if quote_count % 2 != 0:
+            if counts['"'] % 2 != 0:
                 issues.append("⚠️ Unmatched quotes detected")
-            if content.count('{') != content.count('}'):
+            if counts['{'] != counts['}']:
                 issues.append("⚠️ Unmatched curly brackets")
-            if content.count('[') != content.count(']'):
+            if counts['['] != counts[']']:
                 issues.append("⚠️ Unmatched square brackets")
             
             if issues:
@@ -508,7 +872,83 @@ Mode: {'BATCH OPTIMIZED' if USE_BATCH else 'SEQUENTIAL'}
         except IOError as e:
             print(f"\n⚠️ Could not validate syntax: {e}")
 
+    def _print_progress(self, i, start_time):
+        """Redraw the progress line, throttled to PROGRESS_INTERVAL (last line always shown)"""
+        now = time.monotonic()
+        if now - self._last_progress_t < PROGRESS_INTERVAL and i != self.total_lines:
+            return
+        self._last_progress_t = now
+        
+        percent = (i / self.total_lines) * 100
+        success_rate = (self.translation_stats['success'] / max(1, self.translation_stats['total_processed'])) * 100
+        elapsed = time.time() - start_time
+        eta = (elapsed / i) * (self.total_lines - i) if i > 0 else 0
+        
+        batch_info = f"| Batch: {self.translation_stats['batch_success']} " if USE_BATCH else ""
+        print(f"\r📊 {percent:.1f}% | {i}/{self.total_lines} | Success: {success_rate:.0f}% {batch_info}| ETA: {eta:.0f}s", end='', flush=True)
+
+    def _process_lines(self, lines, start_time):
+        """Translate all lines, writing each finished line (or batch) to self._out"""
+        if not USE_BATCH:
+            # Sequential processing
+            for i, line in enumerate(lines, 1):
+                processed = self._process_line(line, i)
+                self._out.write(processed)
+                
+                # No sleep here: JEDA_TERJEMAH is applied per actual trans call
+                # by the rate limiter, so skipped/cached lines cost no wall-clock
+                self._print_progress(i, start_time)
+        else:
+            # Batch processing (Fix #6: process in chunks)
+            pending_lines = []
+            
+            for i, line in enumerate(lines, 1):
+                processed = self._process_line(line, i)
+                
+                if isinstance(processed, dict) and processed['type'] == 'pending':
+                    pending_lines.append(processed)
+                elif pending_lines:
+                    # Keep file order: queue untouched lines behind the open batch
+                    pending_lines.append({'type': 'raw', 'line': processed})
+                else:
+                    self._out.write(processed)
+                
+                # Fix #6: Process batch when full OR every 100 lines (prevent deadlock)
+                # Collect enough lines to keep every worker busy
+                should_process = (
+                    len(pending_lines) >= BATCH_SIZE * MAX_WORKERS or 
+                    i == self.total_lines or
+                    i % 100 == 0  # Force process every 100 lines
+                )
+                
+                if should_process and pending_lines:
+                    batch_results = self._process_pending_lines(pending_lines)
+                    self._out.writelines(batch_results)
+                    pending_lines = []
+                
+                self._print_progress(i, start_time)
+        
+        print()  # New line after progress
+
     def run(self):
+        if not self._trans_cache:
+            self._trans_cache.update(_load_trans_cache())
+        if USE_BATCH and MAX_WORKERS > 1:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        try:
+            return self._run_translation()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            self.close()
+            self._close_log_file()
+            # Persist on success and failure alike
+            if self._cache_dirty:
+                _save_trans_cache(self._trans_cache)
+                self._cache_dirty = False
+
+    def _run_translation(self):
         print(f"\n📂 Processing: {self.input_file}")
         if not os.path.exists(self.input_file):
             print(f"❌ File tidak ditemukan: {self.input_file}")
@@ -517,14 +957,13 @@ Mode: {'BATCH OPTIMIZED' if USE_BATCH else 'SEQUENTIAL'}
         if not self._check_dependencies():
             return False
         
-        # Fix #9: Check if output file is writable
-        try:
-            # Try to open output file for writing (test)
-            with open(self.output_file, 'a', encoding='utf-8') as f:
-                pass
-        except IOError as e:
-            print(f"❌ Cannot write to output file: {e}")
-            print(f"   File might be open in another program")
+        # Fix #9: Check if output file is writable (without creating or touching it;
+        # the single real open happens right before streaming starts)
+        parent = os.path.dirname(self.output_file) or '.'
+        if (not os.access(parent, os.W_OK) or
+                (os.path.exists(self.output_file) and not os.access(self.output_file, os.W_OK))):
+            print(f"❌ Cannot write to output file: {self.output_file}")
+            print(f"   Check folder/file permissions")
             return False
             
         self._init_log_file()
@@ -554,66 +993,26 @@ Mode: {'BATCH OPTIMIZED' if USE_BATCH else 'SEQUENTIAL'}
         
         start_time = time.time()
         
-        if not USE_BATCH:
-            # Sequential processing
-            results = []
-            for i, line in enumerate(lines, 1):
-                processed = self._process_line(line, i)
-                results.append(processed)
-                
-                percent = (i / self.total_lines) * 100
-                success_rate = (self.translation_stats['success'] / max(1, self.translation_stats['total_processed'])) * 100
-                elapsed = time.time() - start_time
-                eta = (elapsed / i) * (self.total_lines - i) if i > 0 else 0
-                print(f"\r📊 {percent:.1f}% | {i}/{self.total_lines} | Success: {success_rate:.0f}% | ETA: {eta:.0f}s", end='', flush=True)
-                
-                if JEDA_TERJEMAH > 0:
-                    time.sleep(JEDA_TERJEMAH)
-        else:
-            # Batch processing (Fix #6: process in chunks)
-            results = []
-            pending_lines = []
-            
-            for i, line in enumerate(lines, 1):
-                processed = self._process_line(line, i)
-                
-                if isinstance(processed, dict) and processed['type'] == 'pending':
-                    pending_lines.append(processed)
-                    
-                    # Fix #6: Process batch when full OR every 100 lines (prevent deadlock)
-                    should_process = (
-                        len(pending_lines) >= BATCH_SIZE or 
-                        i == self.total_lines or
-                        i % 100 == 0  # Force process every 100 lines
-                    )
-                    
-                    if should_process and pending_lines:
-                        batch_results = self._process_pending_lines(pending_lines)
-                        results.extend(batch_results)
-                        pending_lines = []
-                else:
-                    results.append(processed)
-                
-                # Progress
-                percent = (i / self.total_lines) * 100
-                success_rate = (self.translation_stats['success'] / max(1, self.translation_stats['total_processed'])) * 100 if self.translation_stats['total_processed'] > 0 else 0
-                elapsed = time.time() - start_time
-                eta = (elapsed / i) * (self.total_lines - i) if i > 0 else 0
-                
-                batch_info = f"| Batch: {self.translation_stats['batch_success']}" if USE_BATCH else ""
-                print(f"\r📊 {percent:.1f}% | {i}/{self.total_lines} | Success: {success_rate:.0f}% {batch_info} | ETA: {eta:.0f}s", end='', flush=True)
-        
-        print()  # New line after progress
+        # Stream results straight to disk instead of holding the whole script in memory
+        try:
+            self._out = open(self.output_file, 'w', encoding='utf-8', buffering=1 << 16)
+        except IOError as e:
+            print(f"❌ Cannot write to output file: {e}")
+            print(f"   File might be open in another program")
+            return False
         
         # Fix #9: Proper error handling when writing output
         try:
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                f.writelines(results)
+            self._process_lines(lines, start_time)
+            self._out.close()
             print(f"✅ Output saved: {self.output_file}")
         except IOError as e:
-            print(f"❌ Error saving file: {e}")
-            print(f"   Results might be lost!")
+            print(f"\n❌ Error saving file: {e}")
+            print(f"   Output file is incomplete!")
             return False
+        finally:
+            self._out.close()
+            self._out = None
         
         self._validate_output()
         self._write_summary_log()
@@ -648,9 +1047,15 @@ def main():
         return
     
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    rpy_files = glob.glob(os.path.join(current_dir, "*.rpy"))
-    
-    input_files = [f for f in rpy_files if not f.endswith(f"_{BAHASA_TUJUAN}.rpy")]
+    # scandir hands back the stat info, so listing needs no extra open/read per file
+    with os.scandir(current_dir) as it:
+        rpy_entries = sorted(
+            (e for e in it
+             if e.name.endswith('.rpy') and not e.name.endswith(f"_{BAHASA_TUJUAN}.rpy")
+             and e.is_file()),
+            key=lambda e: e.name
+        )
+    input_files = [e.path for e in rpy_entries]
     
     if not input_files:
         print(f"\n❌ Tidak ada file .rpy yang ditemukan di folder ini!")
@@ -658,19 +1063,21 @@ def main():
         return
     
     print(f"\n📋 Ditemukan {len(input_files)} file .rpy:")
-    for i, file in enumerate(input_files, 1):
-        file_name = os.path.basename(file)
+    for i, entry in enumerate(rpy_entries, 1):
         try:
-            file_size = os.path.getsize(file) / 1024
-            with open(file, 'r', encoding='utf-8') as f:
-                line_count = sum(1 for _ in f)
-            print(f"   {i}. {file_name} ({line_count} lines, {file_size:.1f} KB)")
-        except IOError:
-            print(f"   {i}. {file_name} (cannot read)")
+            file_size = entry.stat().st_size / 1024
+            print(f"   {i}. {entry.name} ({file_size:.1f} KB)")
+        except OSError:
+            print(f"   {i}. {entry.name} (cannot read)")
     
     successful_files = []
     failed_files = []
     
+    # One translation cache shared by all files
+    trans_cache = _load_trans_cache()
+    if trans_cache:
+        print(f"\n♻️ Cache: {len(trans_cache)} terjemahan dimuat dari {CACHE_FILE}")
+    
     start_time = time.time()
     
     for i, input_file in enumerate(input_files, 1):
@@ -678,7 +1085,7 @@ def main():
         print(f"📁 FILE {i}/{len(input_files)}")
         print(f"{'='*70}")
         
-        translator = RenPyAutoTranslator(input_file)
+        translator = RenPyAutoTranslator(input_file, trans_cache)
         success = translator.run()
         
         if success: